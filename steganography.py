@@ -8,10 +8,47 @@ Dátum: 2025-10-05
 """
 
 import os
-import struct
+import itertools
+from collections import OrderedDict
 from PIL import Image
 import numpy as np
-from typing import Optional, Tuple, List
+from typing import Optional, Iterable, Iterator
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba je voliteľná - použije sa čistý NumPy
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _embed_kernel(flat, idx, bits):
+        """Zapíše bity do LSB kanálov na pozíciách idx (bez dočasných polí)."""
+        for k in prange(bits.size):
+            p = idx[k]
+            flat[p] = (flat[p] & 0xFE) | bits[k]
+
+    @njit(parallel=True, cache=True)
+    def _extract_kernel(flat, idx):
+        """Prečíta LSB kanálov na pozíciách idx."""
+        out = np.empty(idx.size, dtype=np.uint8)
+        for k in prange(idx.size):
+            out[k] = flat[idx[k]] & 1
+        return out
+else:
+    _embed_kernel = None
+    _extract_kernel = None
+
+
+def _morton_compact(v):
+    """Vyberie párne bity Mortonovho kódu a stlačí ich k sebe (opak prekladania bitov)."""
+    v = v & np.uint64(0x5555555555555555)
+    v = (v | (v >> np.uint64(1))) & np.uint64(0x3333333333333333)
+    v = (v | (v >> np.uint64(2))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v >> np.uint64(4))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v >> np.uint64(8))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v >> np.uint64(16))) & np.uint64(0x00000000FFFFFFFF)
+    return v.astype(np.int64)
 
 
 class SteganographyTool:
@@ -19,181 +56,304 @@ class SteganographyTool:
     
     def __init__(self):
         """Inicializácia steganografického nástroja."""
-        self.HEADER_SIZE_BITS = 1 + 3 + (64 * 8) + 32 + 32  # spolu 580 bitov
+        self.HEADER_MAGIC = 0xA5E6  # 16-bitová značka na začiatku hlavičky
+        self.HEADER_MAGIC_BITS = 16
+        self.HEADER_SIZE_BITS = self.HEADER_MAGIC_BITS + 1 + 3 + (64 * 8) + 32 + 32  # spolu 596 bitov
         self.MAX_FILENAME_LENGTH = 64
+        self.EMBED_CHUNK_BITS = 65536  # veľkosť bloku pre NumPy vkladanie (drží sa v L2 cache)
+        self.FILE_CHUNK_BYTES = 1 << 20  # súbor sa číta a vkladá po 1 MB blokoch
+        self.MORTON_BLOCK_CODES = 1 << 16  # blok Z-krivky = štvorec 256x256 pixelov (mocnina 4)
+        self.IDX_CACHE_SIZE = 2  # počet polí indexov v cache (pri 4K ~200 MB každé)
+        self._idx_cache = OrderedDict()  # (šírka, výška, metóda) -> indexy RGB kanálov (LRU)
         
-    def _text_to_bits(self, text: str) -> str:
-        """Prevedie text na binárny reťazec."""
-        return ''.join(format(ord(char), '08b') for char in text)
+    def _text_to_bits(self, text: str) -> np.ndarray:
+        """Prevedie text (UTF-8) na pole bitov."""
+        return np.unpackbits(np.frombuffer(text.encode('utf-8'), dtype=np.uint8))
     
-    def _bits_to_text(self, bits: str) -> str:
-        """Prevedie binárny reťazec na text."""
-        chars = []
-        for i in range(0, len(bits), 8):
-            byte = bits[i:i+8]
-            if len(byte) == 8:
-                chars.append(chr(int(byte, 2)))
-        return ''.join(chars)
+    def _bits_to_text(self, bits: np.ndarray) -> str:
+        """Prevedie pole bitov na text (UTF-8)."""
+        # Neúplný posledný bajt ignorujeme
+        bits = bits[:len(bits) - len(bits) % 8]
+        return np.packbits(bits).tobytes().decode('utf-8', errors='replace')
     
-    def _file_to_bits(self, filepath: str) -> str:
-        """Načíta súbor a prevedie na binárny reťazec."""
+    def _iter_file_bits(self, filepath: str, n_bytes: int) -> Iterator[np.ndarray]:
+        """Číta najviac n_bytes bajtov súboru po blokoch a každý blok vráti ako pole bitov."""
+        remaining = n_bytes
         with open(filepath, 'rb') as file:
-            file_data = file.read()
-        return ''.join(format(byte, '08b') for byte in file_data)
+            while remaining > 0:
+                chunk = file.read(min(self.FILE_CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield np.unpackbits(np.frombuffer(chunk, dtype=np.uint8))
     
-    def _bits_to_file(self, bits: str, output_path: str):
-        """Prevedie binárny reťazec na súbor."""
-        # Zaistíme, že počet bitov je násobok 8
-        while len(bits) % 8 != 0:
-            bits += '0'
-            
-        bytes_data = bytearray()
-        for i in range(0, len(bits), 8):
-            byte = bits[i:i+8]
-            bytes_data.append(int(byte, 2))
+    def _bits_to_file(self, bits: np.ndarray, output_path: str):
+        """Prevedie pole bitov na súbor."""
+        # Zaistíme, že počet bitov je násobok 8 (doplnenie nulami zprava)
+        pad = (-len(bits)) % 8
+        if pad:
+            bits = np.concatenate([bits, np.zeros(pad, dtype=np.uint8)])
         
         with open(output_path, 'wb') as file:
-            file.write(bytes_data)
+            file.write(np.packbits(bits).tobytes())
     
-    def _get_pixel_positions(self, width: int, height: int, storage_method: int) -> List[Tuple[int, int]]:
-        """Získa pozície pixelov podľa spôsobu uloženia."""
-        positions = []
+    def _pixel_indices(self, width: int, height: int, storage_method: int, count: Optional[int] = None) -> np.ndarray:
+        """Získa indexy pixelov (y * width + x) podľa spôsobu uloženia.
+        
+        Ak je zadaný count, vráti najviac prvých count pixelov.
+        """
+        total = width * height
+        if count is None:
+            count = total
         
         if storage_method == 0:  # Každý pixel
-            for y in range(height):
-                for x in range(width):
-                    positions.append((x, y))
-                    
+            return np.arange(min(total, count), dtype=np.int64)
+        
         elif storage_method == 1:  # Každý párny pixel (párna pozícia v sekvencii)
-            count = 0
-            for y in range(height):
-                for x in range(width):
-                    if count % 2 == 0:
-                        positions.append((x, y))
-                    count += 1
-                    
+            return np.arange(0, min(total, 2 * count), 2, dtype=np.int64)
+        
         elif storage_method == 2:  # Každý nepárny pixel (nepárna pozícia v sekvencii)
-            count = 0
-            for y in range(height):
-                for x in range(width):
-                    if count % 2 == 1:
-                        positions.append((x, y))
-                    count += 1
-                    
+            return np.arange(1, min(total, 2 * count + 1), 2, dtype=np.int64)
+        
         elif storage_method == 3:  # Okraje obrázka
-            # Horný a dolný okraj
-            for x in range(width):
-                positions.append((x, 0))  # horný okraj
-                if height > 1:
-                    positions.append((x, height - 1))  # dolný okraj
+            # Horný a dolný okraj (striedavo, ako pri pôvodnom poradí)
+            top = np.arange(width, dtype=np.int64)
+            if height > 1:
+                rows = np.column_stack([top, (height - 1) * width + top]).reshape(-1)
+            else:
+                rows = top
             
             # Ľavý a pravý okraj (bez rohov, ktoré sú už zahrnuté)
-            for y in range(1, height - 1):
-                positions.append((0, y))  # ľavý okraj
-                if width > 1:
-                    positions.append((width - 1, y))  # pravý okraj
+            left = np.arange(1, height - 1, dtype=np.int64) * width
+            if width > 1:
+                cols = np.column_stack([left, left + width - 1]).reshape(-1)
+            else:
+                cols = left
+            
+            return np.concatenate([rows, cols])[:count]
         
-        return positions
+        elif storage_method == 4:  # Z-order (Mortonovo poradie)
+            return self._morton_indices(width, height, count)
+        
+        return np.empty(0, dtype=np.int64)
     
-    def _embed_bits_in_image(self, image: Image.Image, bits: str, storage_method: int) -> Image.Image:
-        """Vloží bity do obrázka podľa zvoleného spôsobu."""
-        img_array = np.array(image)
-        height, width = img_array.shape[:2]
+    def _capacity_pixels(self, width: int, height: int, storage_method: int) -> int:
+        """Vráti počet pixelov použiteľných danou metódou (bez generovania indexov)."""
+        total = width * height
+        if storage_method in (0, 4):  # Každý pixel / Z-order
+            return total
+        elif storage_method == 1:  # Párne pixely
+            return (total + 1) // 2
+        elif storage_method == 2:  # Nepárne pixely
+            return total // 2
+        elif storage_method == 3:  # Okraje obrázka
+            rows = width * (2 if height > 1 else 1)
+            cols = max(0, height - 2) * (2 if width > 1 else 1)
+            return rows + cols
+        return 0
+    
+    def _morton_indices(self, width: int, height: int, count: Optional[int] = None) -> np.ndarray:
+        """Vráti indexy pixelov v poradí Z-krivky (Mortonov kód), najviac count.
         
-        # Získame pozície pixelov podľa metódy ukrývania
-        positions = self._get_pixel_positions(width, height, storage_method)
+        Poradie začína v ľavom hornom rohu a prechádza štvorce 2^k x 2^k, takže
+        dáta menšie ako 4^k pixelov ostanú v ľavom hornom štvorci 2^k x 2^k.
+        Kódy sa generujú po blokoch zarovnaných na štvorce Z-krivky; bloky mimo
+        obrázka sa preskočia a generovanie skončí po nájdení count pixelov.
+        """
+        total = width * height
+        count = total if count is None else min(count, total)
         
-        # Kontrola, či máme dostatok pixelov
-        if len(positions) * 3 < len(bits):  # 3 kanály RGB
-            raise ValueError(f"Obrázok nemá dostatok pixelov pre uloženie dát. Potreba: {len(bits)} bitov, dostupné: {len(positions) * 3}")
+        # Štvorec so stranou 2^n pokrývajúci obrázok
+        side = 1 << max(0, max(width, height) - 1).bit_length()
+        block = min(side * side, self.MORTON_BLOCK_CODES)
         
-        bit_index = 0
-        for pos_x, pos_y in positions:
-            if bit_index >= len(bits):
+        parts = []
+        found = 0
+        for start in range(0, side * side, block):
+            if found >= count:
                 break
-                
-            # Úprava RGB kanálov (LSB)
-            for channel in range(3):  # RGB
-                if bit_index < len(bits):
-                    # Zmena LSB
-                    img_array[pos_y, pos_x, channel] = (img_array[pos_y, pos_x, channel] & 0xFE) | int(bits[bit_index])
-                    bit_index += 1
+            # Ľavý horný roh štvorca bloku - ak je mimo, celý blok je mimo
+            if int(_morton_compact(np.uint64(start))) >= width or int(_morton_compact(np.uint64(start >> 1))) >= height:
+                continue
+            codes = np.arange(start, start + block, dtype=np.uint64)
+            x = _morton_compact(codes)
+            y = _morton_compact(codes >> np.uint64(1))
+            
+            # Ponecháme len pozície vnútri obrázka
+            inside = (x < width) & (y < height)
+            part = y[inside] * width + x[inside]
+            parts.append(part)
+            found += len(part)
         
-        return Image.fromarray(img_array)
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)[:count]
     
-    def _extract_bits_from_image(self, image: Image.Image, storage_method: int, start_bit: int, end_bit: int) -> str:
-        """Extrahuje bity z obrázka podľa spôsobu uloženia."""
-        img_array = np.array(image)
+    def _channel_indices(self, width: int, height: int, storage_method: int, n_bits: Optional[int] = None) -> np.ndarray:
+        """Vráti indexy RGB kanálov vybraných pixelov v sploštenom poli (H*W*3).
+        
+        Ak je zadaný n_bits, vypočíta len indexy pre prvých n_bits bitov.
+        Výsledky sa ukladajú do malej LRU cache podľa rozmerov obrázka a metódy;
+        keďže kratšie pole je vždy začiatkom dlhšieho, stačí aj uložený prefix.
+        """
+        key = (width, height, storage_method)
+        full_bits = self._capacity_pixels(width, height, storage_method) * 3
+        needed = full_bits if n_bits is None else min(n_bits, full_bits)
+        
+        cached = self._idx_cache.get(key)
+        if cached is not None and len(cached) >= needed:
+            self._idx_cache.move_to_end(key)
+            return cached[:n_bits]
+        
+        count = None if n_bits is None else (n_bits + 2) // 3
+        pixel_idx = self._pixel_indices(width, height, storage_method, count)
+        idx = (pixel_idx[:, None] * 3 + np.arange(3)).reshape(-1)[:n_bits]
+        
+        idx.setflags(write=False)
+        self._idx_cache[key] = idx
+        self._idx_cache.move_to_end(key)
+        while len(self._idx_cache) > self.IDX_CACHE_SIZE:
+            self._idx_cache.popitem(last=False)
+        return idx
+    
+    def _embed_lsb(self, flat: np.ndarray, idx: np.ndarray, bits: np.ndarray):
+        """Zapíše bity do LSB sploštených kanálov na pozíciách idx."""
+        # Numba jadro nekontroluje hranice polí - dĺžky musia sedieť
+        if len(idx) != len(bits):
+            raise ValueError(f"Počet pozícií ({len(idx)}) nezodpovedá počtu bitov ({len(bits)})")
+        
+        if _embed_kernel is not None:
+            _embed_kernel(flat, idx, bits)
+            return
+        
+        # Po blokoch, aby dočasné polia ostali malé a v cache
+        for start in range(0, len(bits), self.EMBED_CHUNK_BITS):
+            chunk_idx = idx[start:start + self.EMBED_CHUNK_BITS]
+            chunk_bits = bits[start:start + self.EMBED_CHUNK_BITS]
+            flat[chunk_idx] = (flat[chunk_idx] & 0xFE) | chunk_bits
+    
+    def _extract_lsb(self, flat: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """Prečíta LSB sploštených kanálov na pozíciách idx."""
+        if _extract_kernel is not None:
+            return _extract_kernel(flat, idx)
+        return (flat[idx] & 1).astype(np.uint8, copy=False)
+    
+    def _load_image_array(self, image_path: str, writable: bool = False) -> np.ndarray:
+        """Načíta obrázok ako pole pixelov (H, W, 3) typu uint8."""
+        image = Image.open(image_path)
+        # Konverzia len ak obrázok ešte nie je RGB
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        img_array = np.frombuffer(image.tobytes(), dtype=np.uint8).reshape(image.height, image.width, 3)
+        # Pole nad bajtmi je len na čítanie - kópia iba ak doň budeme zapisovať
+        return img_array.copy() if writable else img_array
+    
+    def _embed_bits_in_image(self, img_array: np.ndarray, bits: np.ndarray, storage_method: int) -> Image.Image:
+        """Vloží bity do poľa pixelov (H, W, 3) podľa zvoleného spôsobu a vráti obrázok."""
+        return self._embed_chunks_in_image(img_array, [bits], len(bits), storage_method)
+    
+    def _embed_chunks_in_image(self, img_array: np.ndarray, chunks: Iterable[np.ndarray], n_bits: int, storage_method: int) -> Image.Image:
+        """Vloží postupnosť blokov bitov (spolu n_bits) do poľa pixelov a vráti obrázok."""
         height, width = img_array.shape[:2]
         
-        positions = self._get_pixel_positions(width, height, storage_method)
+        # Indexy RGB kanálov vybraných pixelov podľa metódy ukrývania
+        idx = self._channel_indices(width, height, storage_method)
         
-        extracted_bits = []
-        bit_index = 0
+        # Kontrola, či máme dostatok pixelov
+        if len(idx) < n_bits:
+            raise ValueError(f"Obrázok nemá dostatok pixelov pre uloženie dát. Potreba: {n_bits} bitov, dostupné: {len(idx)}")
         
-        for pos_x, pos_y in positions:
-            for channel in range(3):  # RGB
-                if start_bit <= bit_index <= end_bit:
-                    # Získanie LSB
-                    bit = img_array[pos_y, pos_x, channel] & 1
-                    extracted_bits.append(str(bit))
-                
-                bit_index += 1
-                if bit_index > end_bit:
-                    break
-            if bit_index > end_bit:
-                break
+        # Zmena LSB RGB kanálov po blokoch: S = (C & 0xFE) | M
+        flat = img_array.reshape(-1)
+        offset = 0
+        for bits in chunks:
+            if offset + len(bits) > n_bits:
+                raise ValueError(f"Dát je viac, než uvádza hlavička ({n_bits} bitov)")
+            self._embed_lsb(flat, idx[offset:offset + len(bits)], bits)
+            offset += len(bits)
         
-        return ''.join(extracted_bits)
+        # Napr. súbor, ktorý sa počas čítania zmenšil
+        if offset != n_bits:
+            raise ValueError(f"Dát je menej, než uvádza hlavička: {offset} z {n_bits} bitov")
+        
+        return Image.fromarray(img_array)
+    
+    def _extract_bits_from_image(self, img_array: np.ndarray, storage_method: int, start_bit: int, end_bit: int) -> np.ndarray:
+        """Extrahuje bity z poľa pixelov (H, W, 3) podľa spôsobu uloženia."""
+        height, width = img_array.shape[:2]
+        
+        # Stačia indexy po posledný požadovaný bit
+        idx = self._channel_indices(width, height, storage_method, end_bit + 1)
+        
+        # Získanie LSB vybraných kanálov naraz
+        return self._extract_lsb(img_array.reshape(-1), idx[start_bit:])
+    
+    def _magic_bits(self) -> np.ndarray:
+        """Vráti bity značky hlavičky."""
+        return np.unpackbits(np.frombuffer(self.HEADER_MAGIC.to_bytes(2, 'big'), dtype=np.uint8))
     
-    def _create_header(self, is_file: bool, storage_method: int, filename: str, start_pos: int, end_pos: int) -> str:
+    def _has_magic(self, bits: np.ndarray) -> bool:
+        """Overí, či bity začínajú značkou hlavičky."""
+        magic = bits[:self.HEADER_MAGIC_BITS]
+        return len(magic) == self.HEADER_MAGIC_BITS and bool((magic == self._magic_bits()).all())
+    
+    def _create_header(self, is_file: bool, storage_method: int, filename: str, start_pos: int, end_pos: int) -> np.ndarray:
         """Vytvorí hlavičku s metadátami."""
         header = []
         
+        # 0. Značka hlavičky (16 bitov)
+        header.append(self._magic_bits())
+        
         # 1. Typ (1 bit): 1 = súbor, 0 = text
-        header.append('1' if is_file else '0')
+        header.append(np.array([1 if is_file else 0], dtype=np.uint8))
         
         # 2. Spôsob uloženia (3 bity)
-        header.append(format(storage_method, '03b'))
+        header.append(np.unpackbits(np.array([storage_method], dtype=np.uint8))[5:])
         
         # 3. Názov súboru (64 * 8 bitov)
-        filename_padded = filename[:self.MAX_FILENAME_LENGTH].ljust(self.MAX_FILENAME_LENGTH, '\0')
-        header.append(self._text_to_bits(filename_padded))
+        # Orezanie na celé UTF-8 znaky, aby sa názov nerozdelil uprostred znaku
+        filename_bytes = filename.encode('utf-8')[:self.MAX_FILENAME_LENGTH]
+        filename_bytes = filename_bytes.decode('utf-8', errors='ignore').encode('utf-8')
+        filename_bytes = filename_bytes.ljust(self.MAX_FILENAME_LENGTH, b'\0')
+        header.append(np.unpackbits(np.frombuffer(filename_bytes, dtype=np.uint8)))
         
         # 4. Pozícia prvého bitu (32 bitov)
-        header.append(format(start_pos, '032b'))
+        header.append(np.unpackbits(np.frombuffer(start_pos.to_bytes(4, 'big'), dtype=np.uint8)))
         
         # 5. Pozícia posledného bitu (32 bitov)
-        header.append(format(end_pos, '032b'))
+        header.append(np.unpackbits(np.frombuffer(end_pos.to_bytes(4, 'big'), dtype=np.uint8)))
         
-        return ''.join(header)
+        return np.concatenate(header)
     
-    def _parse_header(self, header_bits: str) -> dict:
+    def _parse_header(self, header_bits: np.ndarray) -> dict:
         """Parsuje hlavičku a vráti metadáta."""
         if len(header_bits) < self.HEADER_SIZE_BITS:
             raise ValueError("Neplatná hlavička - príliš krátka")
         
-        offset = 0
+        # Značka hlavičky
+        if not self._has_magic(header_bits):
+            raise ValueError("Neplatná hlavička - chýba značka")
+        offset = self.HEADER_MAGIC_BITS
         
         # Typ
-        is_file = header_bits[offset] == '1'
+        is_file = int(header_bits[offset]) == 1
         offset += 1
         
         # Spôsob uloženia
-        storage_method = int(header_bits[offset:offset+3], 2)
+        storage_method = int((header_bits[offset:offset+3] * np.array([4, 2, 1])).sum())
         offset += 3
         
         # Názov súboru
         filename_bits = header_bits[offset:offset+(64*8)]
-        filename = self._bits_to_text(filename_bits).rstrip('\0')
+        filename = np.packbits(filename_bits).tobytes().rstrip(b'\0').decode('utf-8', errors='replace')
         offset += 64 * 8
         
         # Pozícia prvého bitu
-        start_pos = int(header_bits[offset:offset+32], 2)
+        start_pos = int.from_bytes(np.packbits(header_bits[offset:offset+32]).tobytes(), 'big')
         offset += 32
         
         # Pozícia posledného bitu
-        end_pos = int(header_bits[offset:offset+32], 2)
+        end_pos = int.from_bytes(np.packbits(header_bits[offset:offset+32]).tobytes(), 'big')
         
         return {
             'is_file': is_file,
@@ -203,7 +363,7 @@ class SteganographyTool:
             'end_pos': end_pos
         }
     
-    def hide_file(self, image_path: str, file_path: str, output_path: str, storage_method: int = 0) -> bool:
+    def hide_file(self, image_path: str, file_path: str, output_path: str, storage_method: int = 0, compress_level: int = 1) -> bool:
         """
         Ukryje súbor do obrázka.
         
@@ -211,38 +371,39 @@ class SteganographyTool:
             image_path: Cesta k pôvodnému obrázku
             file_path: Cesta k súboru na ukrytie
             output_path: Cesta k výstupnému obrázku
-            storage_method: Spôsob ukrývania (0-3)
+            storage_method: Spôsob ukrývania (0-4)
+            compress_level: Úroveň PNG kompresie (0-9); nižšia je rýchlejšia, ale
+                súbor je väčší - ukryté LSB bity sa zachovajú pri každej úrovni
         
         Returns:
             bool: True pri úspechu
         """
         try:
             # Načítanie obrázka
-            image = Image.open(image_path).convert('RGB')
+            img_array = self._load_image_array(image_path, writable=True)
             
-            # Načítanie súboru
+            # Veľkosť súboru - samotné dáta sa čítajú až pri vkladaní
             filename = os.path.basename(file_path)
-            file_bits = self._file_to_bits(file_path)
+            file_size = os.path.getsize(file_path)
+            file_size_bits = file_size * 8
             
             # Výpočet pozícii
             start_pos = self.HEADER_SIZE_BITS
-            end_pos = start_pos + len(file_bits) - 1
+            end_pos = start_pos + file_size_bits - 1
             
             # Vytvorenie hlavičky
             header = self._create_header(True, storage_method, filename, start_pos, end_pos)
             
-            # Spojenie hlavičky a dát
-            all_bits = header + file_bits
+            # Vloženie hlavičky a potom súboru po blokoch (pamäť nezávisí od veľkosti súboru)
+            chunks = itertools.chain([header], self._iter_file_bits(file_path, file_size))
+            stego_image = self._embed_chunks_in_image(img_array, chunks, len(header) + file_size_bits, storage_method)
             
-            # Vloženie do obrázka
-            stego_image = self._embed_bits_in_image(image, all_bits, storage_method)
-            
-            # Uloženie
-            stego_image.save(output_path, 'PNG')
+            # Uloženie (PNG je bezstratový, nízka kompresia šetrí čas CPU)
+            stego_image.save(output_path, 'PNG', optimize=False, compress_level=compress_level)
             
             print(f"Súbor '{filename}' bol úspešne ukrytý do obrázka '{output_path}'")
             print(f"Použitá metóda: {storage_method}")
-            print(f"Veľkosť dát: {len(file_bits)} bitov")
+            print(f"Veľkosť dát: {file_size_bits} bitov")
             
             return True
             
@@ -250,11 +411,10 @@ class SteganographyTool:
             print(f"Chyba pri ukrývaní súboru: {e}")
             return False
     
-    def hide_text(self, image_path: str, text: str, output_path: str, storage_method: int = 0) -> bool:
+    def hide_text(self, image_path: str, text: str, output_path: str, storage_method: int = 0, compress_level: int = 1) -> bool:
         try:
             # Načítanie obrázka
-            image = Image.open(image_path).convert('RGB')
-            img_array = np.array(image)
+            img_array = self._load_image_array(image_path, writable=True)
             height, width = img_array.shape[:2]
             
             # Konverzia textu na bity
@@ -269,14 +429,13 @@ class SteganographyTool:
             
             # Kontrola kapacity obrázka
             total_bits = len(header) + len(text_bits)
-            positions = self._get_pixel_positions(width, height, storage_method)
-            available_bits = len(positions) * 3  # 3 kanály RGB
+            available_bits = self._capacity_pixels(width, height, storage_method) * 3  # 3 kanály RGB
             
             if total_bits > available_bits:
                 print(f"\n❌ CHYBA: Text je príliš dlhý!")
                 print(f"Požadované bity: {total_bits}")
                 print(f"Dostupné bity: {available_bits}")
-                print(f"Maximálna dĺžka textu: {(available_bits - len(header)) // 8} znakov")
+                print(f"Maximálna dĺžka textu: {(available_bits - len(header)) // 8} bajtov (UTF-8)")
                 return False
             
             print(f"\n✅ KONTROLA KAPACITY PREŠLA:")
@@ -287,13 +446,13 @@ class SteganographyTool:
             print(f"Využitie: {(total_bits/available_bits)*100:.1f}%")
             
             # Spojenie hlavičky a dát
-            all_bits = header + text_bits
+            all_bits = np.concatenate([header, text_bits])
             
             # Vloženie do obrázka
-            stego_image = self._embed_bits_in_image(image, all_bits, storage_method)
+            stego_image = self._embed_bits_in_image(img_array, all_bits, storage_method)
             
-            # Uloženie
-            stego_image.save(output_path, 'PNG')
+            # Uloženie (PNG je bezstratový, nízka kompresia šetrí čas CPU)
+            stego_image.save(output_path, 'PNG', optimize=False, compress_level=compress_level)
             
             print(f"\nText bol úspešne ukrytý do obrázka '{output_path}'")
             print(f"Použitá metóda: {storage_method}")
@@ -307,13 +466,18 @@ class SteganographyTool:
     def extract_file(self, stego_image_path: str, output_dir: str = ".") -> bool:
         try:
             # Načítanie obrázka
-            image = Image.open(stego_image_path).convert('RGB')
+            # Pole pixelov len na čítanie - zdieľané pre všetky pokusy aj dáta
+            img_array = self._load_image_array(stego_image_path)
             header_bits = None
             used_method = None
             
-            for test_method in range(4):
+            for test_method in range(5):
                 try:
-                    test_header = self._extract_bits_from_image(image, test_method, 0, self.HEADER_SIZE_BITS - 1)
+                    # Najprv len značka - ak nesedí, metódu hneď preskočíme
+                    test_magic = self._extract_bits_from_image(img_array, test_method, 0, self.HEADER_MAGIC_BITS - 1)
+                    if not self._has_magic(test_magic):
+                        continue
+                    test_header = self._extract_bits_from_image(img_array, test_method, 0, self.HEADER_SIZE_BITS - 1)
                     # Skúsime parsovať hlavičku
                     test_metadata = self._parse_header(test_header)
                     # Ak parsovanie prebehlo bez chyby a metóda sa zhoduje
@@ -339,7 +503,7 @@ class SteganographyTool:
             print(f"  Pozícia dát: {metadata['start_pos']} - {metadata['end_pos']}")
 
             data_bits = self._extract_bits_from_image(
-                image, 
+                img_array,
                 metadata['storage_method'], 
                 metadata['start_pos'], 
                 metadata['end_pos']
@@ -411,10 +575,11 @@ def main():
             print("1 - Každý párny pixel")
             print("2 - Každý nepárny pixel") 
             print("3 - Pixely na okrajoch obrázka")
+            print("4 - Každý pixel v poradí Z-krivky")
             
             try:
-                method = int(input("Vyberte metódu (0-3): ").strip())
-                if method not in [0, 1, 2, 3]:
+                method = int(input("Vyberte metódu (0-4): ").strip())
+                if method not in [0, 1, 2, 3, 4]:
                     print("Neplatná metóda!")
                     continue
                     
@@ -435,10 +600,11 @@ def main():
             print("1 - Každý párny pixel")
             print("2 - Každý nepárny pixel") 
             print("3 - Pixely na okrajoch obrázka")
+            print("4 - Každý pixel v poradí Z-krivky")
             
             try:
-                method = int(input("Vyberte metódu (0-3): ").strip())
-                if method not in [0, 1, 2, 3]:
+                method = int(input("Vyberte metódu (0-4): ").strip())
+                if method not in [0, 1, 2, 3, 4]:
                     print("Neplatná metóda!")
                     continue
                     
@@ -476,6 +642,10 @@ def main():
             print("3 - Okraje obrázku:")
             print("    Ukládá data pouze do pixelů na okrajích")
             print("    Nejmenší kapacita, ale nejméně nápadné")
+            print()
+            print("4 - Z-křivka (Mortonovo pořadí):")
+            print("    Ukládá data do všech pixelů v pořadí Z-křivky od levého horního rohu")
+            print("    Nejvyšší kapacita, malá data zůstanou ve čtvercové dlaždici v rohu")
             
         else:
             print("Neplatná volba!")
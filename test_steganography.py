@@ -0,0 +1,112 @@
+"""
+Testy steganografického nástroja - ukrytie a extrakcia pre všetky metódy.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import steganography
+from steganography import SteganographyTool
+
+
+@pytest.fixture(params=['numba', 'numpy'])
+def stego(request, monkeypatch):
+    """Nástroj s Numba jadrom alebo s čistým NumPy."""
+    if request.param == 'numba':
+        if steganography._embed_kernel is None:
+            pytest.skip("numba nie je nainštalovaná")
+    else:
+        monkeypatch.setattr(steganography, '_embed_kernel', None)
+        monkeypatch.setattr(steganography, '_extract_kernel', None)
+    return SteganographyTool()
+
+
+def _cover(tmp_path, width, height, seed=0):
+    """Uloží náhodný RGB obrázok a vráti cestu k nemu."""
+    rng = np.random.default_rng(seed)
+    path = tmp_path / f"cover_{width}x{height}.png"
+    Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8)).save(path)
+    return str(path)
+
+
+COVERS = [(80, 60), (1, 800), (800, 1)]
+
+
+@pytest.mark.parametrize('method', range(5))
+@pytest.mark.parametrize('size', COVERS)
+@pytest.mark.parametrize('payload', [bytes(range(25)), b''], ids=['data', 'empty'])
+def test_hide_file_roundtrip(stego, tmp_path, method, size, payload):
+    cover = _cover(tmp_path, *size)
+    secret = tmp_path / "data.bin"
+    secret.write_bytes(payload)
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+
+    assert stego.hide_file(cover, str(secret), str(tmp_path / "stego.png"), method)
+    assert stego.extract_file(str(tmp_path / "stego.png"), str(out_dir))
+    assert (out_dir / "data.bin").read_bytes() == payload
+
+
+@pytest.mark.parametrize('method', range(5))
+@pytest.mark.parametrize('size', COVERS)
+def test_hide_text_roundtrip(stego, tmp_path, method, size):
+    cover = _cover(tmp_path, *size)
+    text = "Ahoj svet\nšťč ľ€"
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+
+    assert stego.hide_text(cover, text, str(tmp_path / "stego.png"), method)
+    assert stego.extract_file(str(tmp_path / "stego.png"), str(out_dir))
+    assert (out_dir / "user_text.txt").read_text(encoding='utf-8') == text
+
+
+def test_clean_image_is_rejected(stego, tmp_path):
+    cover = _cover(tmp_path, 40, 30)
+
+    assert not stego.extract_file(cover, str(tmp_path))
+    img_array = stego._load_image_array(cover)
+    for method in range(5):
+        bits = stego._extract_bits_from_image(img_array, method, 0, stego.HEADER_MAGIC_BITS - 1)
+        assert not stego._has_magic(bits)
+
+
+def test_payload_too_large(stego, tmp_path):
+    cover = _cover(tmp_path, 10, 10)
+    secret = tmp_path / "data.bin"
+    secret.write_bytes(bytes(1000))
+
+    assert not stego.hide_file(cover, str(secret), str(tmp_path / "stego.png"), 0)
+
+
+def test_long_utf8_filename_is_cut_on_character_boundary(stego, tmp_path):
+    cover = _cover(tmp_path, 80, 60)
+    # 'ľ' má 2 bajty - 64. bajt padne doprostred 33. znaku
+    secret = tmp_path / ('ľ' * 40 + '.bin')
+    secret.write_bytes(b'data')
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+
+    assert stego.hide_file(cover, str(secret), str(tmp_path / "stego.png"), 0)
+    assert stego.extract_file(str(tmp_path / "stego.png"), str(out_dir))
+    names = [p.name for p in out_dir.iterdir()]
+    assert names == ['ľ' * 32]
+    assert '�' not in names[0]
+    assert (out_dir / names[0]).read_bytes() == b'data'
+
+
+@pytest.mark.parametrize('extra_bytes', [1, -1], ids=['overrun', 'underrun'])
+def test_stream_length_mismatch_is_rejected(stego, tmp_path, monkeypatch, extra_bytes):
+    cover = _cover(tmp_path, 80, 60)
+    secret = tmp_path / "data.bin"
+    secret.write_bytes(bytes(25))
+    output = tmp_path / "stego.png"
+
+    # Súbor sa medzi zistením veľkosti a čítaním zväčší / zmenší
+    def fake_iter_file_bits(filepath, n_bytes):
+        yield np.ones((n_bytes + extra_bytes) * 8, dtype=np.uint8)
+
+    monkeypatch.setattr(stego, '_iter_file_bits', fake_iter_file_bits)
+
+    assert not stego.hide_file(cover, str(secret), str(output), 0)
+    assert not output.exists()